@@ -1,16 +1,30 @@
-from typing import Literal
+import logging
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Literal
 from uuid import uuid4
 
-from asyncer import asyncify
 from gradio import ChatMessage, State
+from openai import OpenAIError
+from pydantic_ai.messages import ModelMessage, ToolCallPart
+from pydantic_ai.usage import Usage as RunUsage
 
 from src.ai.agents import AgentDependencies
 from src.ai.agents.example_agent import example_agent
+from src.ai.agents.memory.cache import (
+    embed_prompt,
+    get_cached_response,
+    store_response,
+    warm_up,
+)
 from src.ai.agents.memory.utils import to_pydantic_history
-from src.ai.agents.tools.publications import create_draft_tool, register_tools
+from src.ai.agents.memory.writer import memory_writer
+from src.ai.models.openai import openai_model
 from src.ui import History, Usage, create_chat_ui
 from src.users.entities.user import CurrentUser
 
+logger = logging.getLogger(__name__)
+
 # Available agents for demo purposes
 agents = {
     "example_agent": example_agent,
@@ -25,65 +39,131 @@ current_user = CurrentUser(
     language="en",
 )
 
+# Dependencies are immutable, so they are built once and shared by every turn
+agent_dependencies = AgentDependencies(current_user=current_user)
+
+# Streaming runners with dependencies already bound, one per available agent
+runners = {
+    name: partial(agent.run_stream, deps=agent_dependencies)
+    for name, agent in agents.items()
+}
+
 
-def handle_user_message(
+async def handle_user_message(
     user_input: str,
     history: History,
+    model_history: list[ModelMessage],
     selected_agent: Literal["example_agent"],
     current_usage: Usage,
     total_usage: Usage,
-) -> tuple[str, History, Usage, Usage]:
+) -> AsyncIterator[tuple[str, History, list[ModelMessage], Usage, Usage]]:
     """
-    Process user message and generate response from the selected agent.
+    Process user message and stream the response from the selected agent.
     
     This function orchestrates the flow of:
-    1. Agent selection and dependency injection
-    2. Tool registration for the agent
-    3. Message processing with conversation history
+    1. Semantic cache lookup for standalone, previously answered prompts
+    2. Message streaming through the agent's pre-bound runner
+    3. Batched write of the turn to long-term memory
     4. Usage tracking and state updates
+
+    Partial responses are yielded as they arrive so the chat shows the first
+    tokens without waiting for the full generation.
     """
-    agent = agents[selected_agent]
-    agent_dependencies = AgentDependencies(current_user=current_user)
-
-    # Register available tools for the agent
-    tools = [create_draft_tool]
-    register_tools(agent, tools)
-
-    # Run agent with conversation history
-    response = agent.run_sync(
-        user_input,
-        message_history=to_pydantic_history(history),
-        deps=agent_dependencies,
-    )
-    
-    assert response is not None, "Agent response should not be None"
-    assert response.output is not None, "Agent response content should not be None"
+    # Only a turn without prior context can safely reuse a cached response
+    prompt_vector: list[float] | None = None
+    output: str | None = None
+    if not history:
+        prompt_vector = await embed_prompt(user_input)
+        output = await get_cached_response(current_user.id, prompt_vector)
+
+    if output is None:
+        message_history = to_pydantic_history(history, model_history)
+
+        # Gradio passes a fresh list per request, so the turn is added in place
+        output = ""
+        assistant_message = ChatMessage(output, "assistant")
+        history.extend((ChatMessage(user_input, "user"), assistant_message))
+
+        # Stream agent response with conversation history
+        async with runners[selected_agent](
+            user_input, message_history=message_history
+        ) as result:
+            async for chunk in result.stream_text(delta=True):
+                output += chunk
+                assistant_message.content = output
+                yield (
+                    "",  # Clear input box
+                    history,
+                    model_history,
+                    current_usage,
+                    total_usage,
+                )
+
+        assert output, "Agent response content should not be empty"
+
+        response_usage = result.usage()
+
+        # Replaying a tool run would skip its side effects, e.g. a new draft
+        called_tools = any(
+            isinstance(part, ToolCallPart)
+            for message in result.new_messages()
+            for part in message.parts
+        )
+        if prompt_vector is not None and not called_tools:
+            await store_response(current_user.id, user_input, output, prompt_vector)
+    else:
+        # Cache hit: no model request was made for this turn
+        history.extend(
+            (ChatMessage(user_input, "user"), ChatMessage(output, "assistant"))
+        )
+        response_usage = RunUsage()
+
+    # Persist the turn to long-term memory without waiting for Qdrant
+    memory_writer.enqueue(current_user.id, "user", user_input)
+    memory_writer.enqueue(current_user.id, "assistant", output)
 
     # Track API usage
-    response_usage = response.usage()
-    new_history = history + [
-        ChatMessage(user_input, "user"),
-        ChatMessage(response.output, "assistant"),
-    ]
-    
     current_usage.requests = response_usage.requests
-    current_usage.request_tokens = response_usage.request_tokens
-    current_usage.response_tokens = response_usage.response_tokens
-    current_usage.total_tokens = response_usage.total_tokens
+    current_usage.request_tokens = response_usage.request_tokens or 0
+    current_usage.response_tokens = response_usage.response_tokens or 0
+    current_usage.total_tokens = response_usage.total_tokens or 0
     total_usage.update(current_usage)
 
-    return (
+    yield (
         "",  # Clear input box
-        new_history,
+        history,
+        to_pydantic_history(history, model_history),
         current_usage,
         total_usage,
     )
 
 
+@asynccontextmanager
+async def lifespan(app: Any) -> AsyncIterator[None]:
+    """Prepare the memory collection on startup and flush pending writes on shutdown."""
+    # Pay first-call connection costs on the serving loop, before any user message.
+    # Failures are logged and left for the first request to retry.
+    await warm_up()
+
+    try:
+        await memory_writer.ensure_collection()
+    except Exception:
+        logger.warning("Failed to prepare the Qdrant collection", exc_info=True)
+
+    try:
+        # Opens the connection pool of the client used by the chat agents
+        await openai_model.client.models.retrieve(openai_model.model_name)
+    except OpenAIError:
+        logger.warning("Failed to warm up the OpenAI client", exc_info=True)
+
+    yield
+    await memory_writer.aclose()
+
+
 if __name__ == "__main__":
     demo = create_chat_ui(
         [],
         handle_user_message,  # type: ignore[call-arg]
         ["example_agent"],
     )
-    demo.launch()
+    demo.launch(app_kwargs={"lifespan": lifespan})
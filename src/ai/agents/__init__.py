@@ -1,10 +1,12 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from ...users.entities.user import CurrentUser
 
 
 class AgentDependencies(BaseModel):
     """Agent dependencies inject in every call."""
 
+    model_config = ConfigDict(frozen=True)
+
     current_user: CurrentUser = Field(
         ...,
         description="User registry for storing and retrieving user information.",
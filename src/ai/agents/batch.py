@@ -0,0 +1,225 @@
+import asyncio
+import re
+
+from pydantic_ai import Agent
+
+from . import AgentDependencies
+
+BATCH_INSTRUCTIONS = (
+    "Answer each row below independently, as if it were a separate request. "
+    "Start every answer with the same '### Row <n>' header as its row and do "
+    "not write anything outside the rows."
+)
+
+_ROW_HEADER = re.compile(r"^### Row (\d+)[ \t]*$", re.MULTILINE)
+
+
+def _escape_row_headers(prompt: str) -> str:
+    """Escape lines of a prompt that would otherwise read as a row header."""
+    return _ROW_HEADER.sub(lambda match: "\\" + match.group(0), prompt)
+
+
+def build_batch_prompt(prompts: list[str]) -> str:
+    """
+    Marshal several prompts into a single numbered prompt.
+
+    Lines inside a prompt that look like a row header are escaped, so they
+    cannot be mistaken for the start of another row.
+
+    Args:
+        prompts: Prompts to answer in one model call
+
+    Returns:
+        Prompt containing the batch instructions and one row per prompt
+    """
+    rows = "\n\n".join(
+        f"### Row {index}\n{_escape_row_headers(prompt)}"
+        for index, prompt in enumerate(prompts, 1)
+    )
+    return f"{BATCH_INSTRUCTIONS}\n\n{rows}"
+
+
+def split_batch_output(output: str) -> dict[int, str]:
+    """
+    Split a batched model answer back into per-row answers.
+
+    Args:
+        output: Model output following the '### Row <n>' convention
+
+    Returns:
+        Mapping of 1-based row number to its answer. Rows the model skipped,
+        or answered more than once, are missing from the mapping.
+    """
+    headers = list(_ROW_HEADER.finditer(output))
+    rows: dict[int, str] = {}
+    repeated = set()
+
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        end = next_header.start() if next_header else len(output)
+        row = int(header.group(1))
+        if row in rows:
+            repeated.add(row)
+        rows[row] = output[header.end() : end].strip()
+
+    # Which of several answers belongs to the row is ambiguous, so none is kept
+    for row in repeated:
+        del rows[row]
+
+    return rows
+
+
+async def answer_rows(
+    agent: Agent[AgentDependencies, str],
+    prompts: list[str],
+    deps: AgentDependencies,
+) -> list[str]:
+    """
+    Answer several independent prompts with one model call.
+
+    Rows missing from the batched answer are asked again concurrently, one
+    dedicated call per row.
+
+    Args:
+        agent: Agent used to answer every prompt
+        prompts: Independent prompts, answered without conversation history
+        deps: Dependencies shared by every row
+
+    Returns:
+        Answers in the same order as ``prompts``
+    """
+    if len(prompts) == 1:
+        # Nothing to amortize, keep the prompt untouched
+        response = await agent.run(prompts[0], deps=deps)
+        return [response.output]
+
+    response = await agent.run(build_batch_prompt(prompts), deps=deps)
+    answers = split_batch_output(response.output)
+
+    # Model skipped or garbled these rows, fall back to dedicated calls
+    missing = [index for index in range(1, len(prompts) + 1) if index not in answers]
+    retries = await asyncio.gather(
+        *(agent.run(prompts[index - 1], deps=deps) for index in missing)
+    )
+    answers.update((index, retry.output) for index, retry in zip(missing, retries))
+
+    return [answers[index] for index in range(1, len(prompts) + 1)]
+
+
+class BatchProcessor:
+    """
+    Aggregate concurrent prompts for one agent into a single model call.
+
+    Prompts submitted within ``window_ms`` of each other (up to ``max_batch``)
+    are sent as one numbered prompt, trading a little per-prompt latency for
+    fewer round-trips and rate-limit headroom. Batching drops conversation
+    history and shares one context between rows, so it is meant for
+    independent, history-less prompts such as batch evaluations, not for
+    interactive multi-user chat.
+
+    Prompts are only combined when they go through the same processor, so
+    create one per agent and share it between concurrent callers.
+    """
+
+    def __init__(
+        self,
+        agent: Agent[AgentDependencies, str],
+        deps: AgentDependencies,
+        window_ms: int = 50,
+        max_batch: int = 8,
+    ) -> None:
+        self.agent = agent
+        self.deps = deps
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future[str]]] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+        self._in_flight: list[tuple[str, asyncio.Future[str]]] = []
+
+    async def submit(self, prompt: str) -> str:
+        """Queue a prompt and wait for its answer from the next batch."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop the background worker. Queued and in-flight prompts are cancelled."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        pending = self._in_flight
+        self._in_flight = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+
+        for _, future in pending:
+            future.cancel()
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Tracked so aclose can cancel callers if the worker is stopped
+            self._in_flight = batch
+            await self._run_batch(batch)
+            self._in_flight = []
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future[str]]]) -> None:
+        try:
+            answers = await answer_rows(
+                self.agent, [prompt for prompt, _ in batch], self.deps
+            )
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+
+async def run_batched(
+    agent: Agent[AgentDependencies, str],
+    prompts: list[str],
+    deps: AgentDependencies,
+    max_batch: int = 8,
+) -> list[str]:
+    """
+    Answer many independent prompts with as few model calls as possible.
+
+    The prompts are already known, so they are split into chunks of up to
+    ``max_batch`` rows and every chunk is sent concurrently. Use a shared
+    ``BatchProcessor`` to combine prompts arriving from concurrent callers.
+
+    Args:
+        agent: Agent used to answer every prompt
+        prompts: Independent prompts, answered without conversation history
+        deps: Dependencies shared by every row
+        max_batch: Maximum number of rows per model call
+
+    Returns:
+        Answers in the same order as ``prompts``
+    """
+    chunks = [prompts[i : i + max_batch] for i in range(0, len(prompts), max_batch)]
+    answers = await asyncio.gather(
+        *(answer_rows(agent, chunk, deps) for chunk in chunks)
+    )
+    return [answer for chunk_answers in answers for answer in chunk_answers]
@@ -1,9 +1,11 @@
 import datetime
+import time
 
 from pydantic_ai import Agent, RunContext
 
 from ..models import openai_model
 from . import AgentDependencies
+from .tools.publications import create_draft_tool
 
 SYSTEM_INSTRUCTIONS = """**ROLE**  
 You are an AI assistant specialized in content creation and research. Your core capabilities include:  
@@ -67,9 +69,29 @@ example_agent = Agent(
     name="example-agent",
     deps_type=AgentDependencies,
     instructions=SYSTEM_INSTRUCTIONS,
+    tools=[create_draft_tool],
 )
 
 
+# (minute bucket, formatted UTC time) shared by every agent turn
+_minute_cache: tuple[int, str] = (0, "")
+
+
+def _current_minute() -> str:
+    """Return the current UTC time at minute resolution, formatted once per minute."""
+    global _minute_cache
+
+    bucket = int(time.time() // 60)
+    if _minute_cache[0] != bucket:
+        _minute_cache = (
+            bucket,
+            datetime.datetime.fromtimestamp(
+                bucket * 60, datetime.timezone.utc
+            ).isoformat(timespec="minutes"),
+        )
+    return _minute_cache[1]
+
+
 @example_agent.instructions
 def add_user_metadata(ctx: RunContext[AgentDependencies]) -> str:
     """
@@ -78,17 +100,8 @@ def add_user_metadata(ctx: RunContext[AgentDependencies]) -> str:
     This dynamic instruction adds personalized context about the current user,
     allowing the agent to tailor responses appropriately.
     """
-    user = ctx.deps.current_user
-    current_time = datetime.datetime.now(datetime.timezone.utc).strftime(
-        "%Y-%m-%d %H:%M:%S %Z"
-    )
-    
     return (
         "**METADATA**\n"
-        f"Current time (UTC): {current_time}\n"
-        f"User name: {user.name}\n"
-        f"User language: {user.language or '[infer from first interaction]'}\n"
-        f"User sector: {user.sector}\n"
-        f"User profession: {user.profession}"
+        f"Current time (UTC): {_current_minute()}\n"
+        f"{ctx.deps.current_user.metadata_summary}"
     )
-
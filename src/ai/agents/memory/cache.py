@@ -0,0 +1,216 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import cache
+from typing import Any, cast
+from uuid import UUID
+
+import numpy as np
+from asyncer import asyncify
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from redisvl.exceptions import RedisVLError
+from redisvl.extensions.cache.llm import SemanticCache
+from redisvl.query.filter import Tag
+from redisvl.utils.vectorize import HFTextVectorizer
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Credentials and database from settings, applied to every Redis connection
+redis_connection_kwargs: dict[str, Any] = {
+    "password": settings.redis_password,
+    "db": settings.redis_db,
+}
+
+
+@cache
+def get_embedder() -> HFTextVectorizer:
+    """
+    Load the local sentence-transformers model used to embed prompts on first use.
+
+    Loading reads the model from disk (or downloads it) and runs a probe
+    embedding, so it is deferred like the Redis connection below.
+    """
+    return HFTextVectorizer(model=settings.semantic_cache_embedding_model)
+
+
+@cache
+def get_semantic_cache() -> SemanticCache:
+    """
+    Build the semantic cache shared by all agents on first use.
+
+    Construction connects to Redis to create the index, so it is deferred
+    until a request needs it rather than done at import time. Entries are
+    isolated per user through a tag filter.
+    """
+    return SemanticCache(
+        name="agent_cache",
+        redis_url=settings.redis_url,
+        connection_kwargs=redis_connection_kwargs,
+        distance_threshold=settings.semantic_cache_distance_threshold,
+        ttl=settings.semantic_cache_ttl,
+        vectorizer=get_embedder(),
+        filterable_fields=[{"name": "user_id", "type": "tag"}],
+    )
+
+
+# Raw Redis client for the content-hashed embedding cache, returning bytes
+redis_client: Redis = Redis.from_url(
+    settings.redis_url,
+    password=settings.redis_password,
+    db=settings.redis_db,
+    decode_responses=False,
+)
+
+# In-process LRU in front of Redis for single-worker repeats
+_local_embeddings: OrderedDict[str, list[float]] = OrderedDict()
+
+
+def quantize_embedding(vector: list[float]) -> bytes:
+    """
+    Scalar-quantize an embedding to int8 with a per-vector scale.
+
+    Returns:
+        The float32 scale followed by one int8 per dimension
+    """
+    values = np.asarray(vector, dtype=np.float32)
+    scale = np.float32(np.max(np.abs(values)) / 127.0) or np.float32(1.0)
+    quantized = np.round(values / scale).astype(np.int8)
+    return bytes(scale.tobytes()) + bytes(quantized.tobytes())
+
+
+def dequantize_embedding(buffer: bytes) -> list[float]:
+    """Restore an embedding produced by ``quantize_embedding``."""
+    scale = np.frombuffer(buffer[:4], dtype=np.float32)[0]
+    quantized = np.frombuffer(buffer[4:], dtype=np.int8)
+    return cast(list[float], (quantized.astype(np.float32) * scale).tolist())
+
+
+async def embed_prompt(prompt: str) -> list[float]:
+    """
+    Embed a prompt, reusing previous embeddings of the exact same text.
+
+    Embeddings are keyed by a blake2b digest of the prompt and looked up in an
+    in-process LRU first, then in Redis as int8-quantized bytes. Only misses
+    run the embedding model. Redis errors are logged and the prompt is
+    embedded directly, so the cache never fails a chat turn.
+
+    Args:
+        prompt: Text to embed
+
+    Returns:
+        Embedding vector of the prompt
+    """
+    key = "emb:q8:" + hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+    vector = _local_embeddings.get(key)
+    if vector is not None:
+        _local_embeddings.move_to_end(key)
+        return vector
+
+    try:
+        cached = cast(bytes | None, await redis_client.get(key))
+    except RedisError:
+        logger.warning("Embedding cache lookup failed", exc_info=True)
+        cached = None
+
+    if cached is not None:
+        vector = dequantize_embedding(cached)
+    else:
+        embedder = await asyncify(get_embedder)()
+        vector = await asyncify(embedder.embed)(prompt)
+        try:
+            await redis_client.set(
+                key,
+                quantize_embedding(vector),
+                ex=settings.embedding_cache_ttl,
+            )
+        except RedisError:
+            logger.warning("Failed to store prompt embedding", exc_info=True)
+
+    _local_embeddings[key] = vector
+    if len(_local_embeddings) > settings.embedding_cache_size:
+        _local_embeddings.popitem(last=False)
+
+    return vector
+
+
+async def warm_up() -> None:
+    """
+    Load the embedding model and open the cache connections ahead of users.
+
+    Runs one throwaway lookup, which makes RedisVL build its async search
+    index and opens both Redis connection pools. This must run on the serving
+    event loop, since async connections are bound to the loop that opened
+    them. Redis errors are logged and left for the first request to retry.
+    """
+    embedder = await asyncify(get_embedder)()
+    vector = await asyncify(embedder.embed)("warm up")
+
+    try:
+        semantic_cache = await asyncify(get_semantic_cache)()
+        await semantic_cache.acheck(vector=vector, num_results=1)
+        await redis_client.ping()
+    except (RedisError, RedisVLError):
+        logger.warning("Failed to warm up the Redis caches", exc_info=True)
+
+
+async def get_cached_response(user_id: UUID, vector: list[float]) -> str | None:
+    """
+    Look up a previous agent response for a semantically similar prompt.
+
+    Only standalone prompts, sent without prior conversation, should be looked
+    up: follow-ups like "yes, go ahead" depend on context the cache ignores.
+
+    Args:
+        user_id: Owner of the conversation, used to isolate cache entries
+        vector: Embedding of the current user prompt
+
+    Returns:
+        The cached response text, or None on a cache miss or Redis error
+    """
+    try:
+        semantic_cache = await asyncify(get_semantic_cache)()
+        hits = await semantic_cache.acheck(
+            vector=vector,
+            num_results=1,
+            filter_expression=Tag("user_id") == str(user_id),
+        )
+    except (RedisError, RedisVLError):
+        logger.warning("Semantic cache lookup failed, treating as miss", exc_info=True)
+        return None
+
+    return hits[0]["response"] if hits else None
+
+
+async def store_response(
+    user_id: UUID,
+    prompt: str,
+    response: str,
+    vector: list[float],
+) -> None:
+    """
+    Store an agent response so paraphrased prompts can reuse it.
+
+    Callers should skip runs that depended on conversation history or called
+    tools, since replaying those would return stale or side-effect results.
+    Redis errors are logged and ignored.
+
+    Args:
+        user_id: Owner of the conversation, used to isolate cache entries
+        prompt: The user prompt that produced the response
+        response: The agent response text
+        vector: Embedding of the user prompt
+    """
+    try:
+        semantic_cache = await asyncify(get_semantic_cache)()
+        await semantic_cache.astore(
+            prompt=prompt,
+            response=response,
+            vector=vector,
+            filters={"user_id": str(user_id)},
+        )
+    except (RedisError, RedisVLError):
+        logger.warning("Failed to store response in semantic cache", exc_info=True)
@@ -1,24 +1,55 @@
+from typing import cast
+
 from gradio import ChatMessage
 from pydantic_ai.messages import (
     ModelMessage,
-    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
     TextPart,
     UserPromptPart,
 )
 
 from src.ui import ChatMessage, History
 
+# Gradio role -> (Pydantic AI message class, part class)
+_ROLE_MAP = {
+    "user": (ModelRequest, UserPromptPart),
+    "assistant": (ModelResponse, TextPart),
+    "system": (ModelResponse, TextPart),
+}
+
+
+def _to_model_message(message: ChatMessage | dict) -> ModelMessage:
+    """Convert a single Gradio message, as ChatMessage or dict, to Pydantic AI."""
+    role: str | None
+    content: str | None
+    if isinstance(message, ChatMessage):
+        role, content = message.role, cast(str, message.content)
+    else:
+        role, content = message.get("role"), message.get("content")
+        assert role and content, "Message must have 'role' and 'content' keys"
+
+    message_cls, part_cls = _ROLE_MAP[role]
+    return cast(ModelMessage, message_cls(parts=[part_cls(content=content)]))
+
 
-def to_pydantic_history(chat_history: History) -> list[ModelMessage]:
+def to_pydantic_history(
+    chat_history: History,
+    validated_history: list[ModelMessage] | None = None,
+) -> list[ModelMessage]:
     """
     Convert Gradio chat history to Pydantic AI message format.
     
     This utility handles the transformation between Gradio's ChatMessage format
     and Pydantic AI's ModelMessage format, ensuring compatibility with the
-    agent framework.
+    agent framework. Messages are instantiated directly rather than validated
+    through ModelMessagesTypeAdapter, since their shape is already known.
     
     Args:
         chat_history: List of ChatMessage objects from Gradio interface
+        validated_history: Previously converted messages for a prefix of
+            ``chat_history``. Only the messages after that prefix are converted,
+            and the list is extended in place so it can be kept across turns.
         
     Returns:
         List of ModelMessage objects compatible with Pydantic AI agents
@@ -26,39 +57,19 @@ def to_pydantic_history(chat_history: History) -> list[ModelMessage]:
     Note:
         Future enhancement: Add intelligent message trimming to fit model context length
     """
-    pydantic_history = []
-    
-    for message in chat_history:
-        # Handle both ChatMessage objects and dict formats
-        if not isinstance(message, ChatMessage):
-            assert message.get("role") and message.get(
-                "content"
-            ), "Message must have 'role' and 'content' keys"
+    if validated_history is None:
+        validated_history = []
 
-            message = ChatMessage(
-                content=message.get("content"), 
-                role=message.get("role")
-            )
+    if len(validated_history) == len(chat_history):
+        # Nothing new to convert, e.g. an empty first turn or a repeated call
+        return validated_history
 
-        # Convert to Pydantic AI message format
-        pydantic_history.append(
-            {
-                "role": "model" if message.role == "assistant" else message.role,
-                "parts": [
-                    (
-                        UserPromptPart(
-                            content=message.content,  # type: ignore[call-arg]
-                            part_kind="user-prompt",
-                        )
-                        if message.role == "user"
-                        else TextPart(
-                            content=message.content,  # type: ignore[call-arg]
-                            part_kind="text",
-                        )
-                    )
-                ],
-                "kind": "request" if message.role == "user" else "response",
-            }
-        )
-        
-    return ModelMessagesTypeAdapter.validate_python(pydantic_history)
+    if len(validated_history) > len(chat_history):
+        # Chat history was reset or edited, the cached prefix no longer applies
+        validated_history.clear()
+
+    validated_history.extend(
+        map(_to_model_message, chat_history[len(validated_history) :])
+    )
+
+    return validated_history
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from uuid import UUID, uuid4
+
+from openai import AsyncOpenAI
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    PayloadSchemaType,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (point_id, user_id, role, content, timestamp)
+PendingMessage = tuple[UUID, UUID, str, str, int]
+
+
+class MemoryWriter:
+    """
+    Write-behind batcher for conversation messages stored in Qdrant.
+
+    Messages are queued without blocking the chat turn and flushed by a
+    background task once ``max_batch_size`` messages are pending or
+    ``batch_timeout_ms`` has passed since the first one. Each batch is
+    embedded with one call to the OpenAI embedding model, and with
+    ``parallel_batching`` it is split into ``parallelism`` concurrent upserts.
+
+    Failed batches are retried ``max_retries`` times with exponential backoff,
+    then written one message at a time so a single bad message cannot drop
+    the rest. Point ids are assigned on enqueue, so retries never duplicate
+    points.
+    """
+
+    def __init__(
+        self,
+        client: AsyncQdrantClient,
+        collection_name: str,
+        openai_client: AsyncOpenAI,
+        embedding_model: str,
+        vector_size: int,
+        max_batch_size: int = 100,
+        batch_timeout_ms: int = 1000,
+        parallel_batching: bool = True,
+        parallelism: int = 4,
+        max_retries: int = 3,
+        retry_backoff_ms: int = 1000,
+    ) -> None:
+        self.client = client
+        self.collection_name = collection_name
+        self.openai_client = openai_client
+        self.embedding_model = embedding_model
+        self.vector_size = vector_size
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout_ms / 1000
+        self.parallel_batching = parallel_batching
+        self.parallelism = parallelism
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self._queue: asyncio.Queue[PendingMessage] = asyncio.Queue()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._collection_ready = False
+
+    async def ensure_collection(self) -> None:
+        """
+        Create the collection, or verify an existing one matches the embeddings.
+
+        New collections store cosine vectors of ``vector_size`` dimensions with
+        int8 scalar quantization kept in RAM, and index ``user_id`` for
+        filtered retrieval.
+
+        Raises:
+            ValueError: If the existing collection has another size or distance
+        """
+        if self._collection_ready:
+            return
+
+        if await self.client.collection_exists(self.collection_name):
+            info = await self.client.get_collection(self.collection_name)
+            vectors = info.config.params.vectors
+            if (
+                not isinstance(vectors, VectorParams)
+                or vectors.size != self.vector_size
+                or vectors.distance != Distance.COSINE
+            ):
+                raise ValueError(
+                    f"Qdrant collection {self.collection_name!r} must store "
+                    f"{self.vector_size}-dimensional cosine vectors, "
+                    f"found {vectors}"
+                )
+        else:
+            await self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(
+                    size=self.vector_size, distance=Distance.COSINE
+                ),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8, quantile=0.99, always_ram=True
+                    )
+                ),
+            )
+            await self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="user_id",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
+
+        self._collection_ready = True
+
+    def enqueue(self, user_id: UUID, role: str, content: str) -> None:
+        """
+        Queue a conversation message for the next batched upsert.
+
+        Blank messages are skipped, since there is nothing to embed.
+
+        Args:
+            user_id: Owner of the message, stored for filtered retrieval
+            role: Chat role of the message author
+            content: Message text
+        """
+        if not content.strip():
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self.flush_loop())
+
+        self._queue.put_nowait((uuid4(), user_id, role, content, int(time.time())))
+
+    async def flush_loop(self) -> None:
+        """Drain the queue into batched upserts until cancelled."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_timeout
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def aclose(self) -> None:
+        """
+        Flush queued messages, then stop the background task.
+
+        Messages that still fail after their retries are logged and dropped.
+        """
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._queue.join()
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._flush_task = None
+
+        # Messages left behind by a flush task that is no longer running
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if batch:
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[PendingMessage]) -> None:
+        for attempt in range(self.max_retries):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                await self._write(batch)
+                return
+            except Exception:
+                logger.warning(
+                    "Failed to write %d messages to Qdrant (attempt %d of %d)",
+                    len(batch),
+                    attempt + 1,
+                    self.max_retries,
+                    exc_info=True,
+                )
+
+        if len(batch) == 1:
+            logger.error("Dropped message %s after failed writes", batch[0][0])
+            return
+
+        # Isolate the failing messages so the rest of the batch is still stored
+        for message in batch:
+            try:
+                await self._write([message])
+            except Exception:
+                logger.exception("Dropped message %s after failed writes", message[0])
+
+    async def _write(self, batch: list[PendingMessage]) -> None:
+        await self.ensure_collection()
+
+        embeddings = await self.openai_client.embeddings.create(
+            model=self.embedding_model,
+            dimensions=self.vector_size,
+            input=[content for _, _, _, content, _ in batch],
+        )
+
+        points = [
+            PointStruct(
+                id=str(point_id),
+                vector=embedding.embedding,
+                payload={
+                    "user_id": str(user_id),
+                    "message": content,
+                    "role": role,
+                    "timestamp": timestamp,
+                },
+            )
+            for (point_id, user_id, role, content, timestamp), embedding in zip(
+                batch, embeddings.data
+            )
+        ]
+
+        chunks = [points]
+        if self.parallel_batching and len(points) > 1:
+            size = -(-len(points) // self.parallelism)
+            chunks = [points[i : i + size] for i in range(0, len(points), size)]
+
+        await asyncio.gather(
+            *(
+                self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=chunk,
+                    wait=False,
+                )
+                for chunk in chunks
+            )
+        )
+
+
+# Shared writer for the conversation collection
+memory_writer = MemoryWriter(
+    AsyncQdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key),
+    settings.qdrant_collection_name,
+    AsyncOpenAI(api_key=settings.openai_api_key),
+    settings.openai_embedding_model,
+    settings.openai_embedding_dimensions,
+    max_batch_size=settings.qdrant_max_batch_size,
+    batch_timeout_ms=settings.qdrant_batch_timeout_ms,
+    parallel_batching=settings.qdrant_parallel_batching,
+)
@@ -1,12 +1,31 @@
+import os
 from typing import Literal
-from uuid import uuid4
+from uuid import UUID
 
-from pydantic_ai import Agent, RunContext, Tool
+from pydantic_ai import RunContext, Tool
 
 from .. import AgentDependencies
 
 PublicationPlatform = Literal["instagram", "linkedin", "twitter", "blog"]
 
+# Random bytes read from the OS in bulk and handed out 16 at a time for draft ids
+_RANDOM_POOL_SIZE = 4096
+_random_pool = b""
+_random_offset = 0
+
+
+def _new_draft_id() -> UUID:
+    """Build a UUIDv4 from the pooled random bytes, refilling when exhausted."""
+    global _random_pool, _random_offset
+
+    if _random_offset + 16 > len(_random_pool):
+        _random_pool = os.urandom(_RANDOM_POOL_SIZE)
+        _random_offset = 0
+
+    chunk = _random_pool[_random_offset : _random_offset + 16]
+    _random_offset += 16
+    return UUID(bytes=chunk, version=4)
+
 
 async def create_draft(
     ctx: RunContext[AgentDependencies],
@@ -37,9 +56,9 @@ async def create_draft(
     # 2. Store draft in database
     # 3. Return actual draft URL for user review
     
-    draft_id = uuid4()
+    draft_id = _new_draft_id()
     return {
-        "publication_url": f"https://example.com/draft/{draft_id}",
+        "publication_url": "https://example.com/draft/" + draft_id.hex,
         "platform": platform,
         "status": "draft_created"
     }
@@ -51,27 +70,3 @@ create_draft_tool = Tool(
     function=create_draft,
 )
 
-
-def register_tools(
-    agent: Agent[AgentDependencies, str], 
-    tools: list[Tool[AgentDependencies]]
-) -> None:
-    """
-    Dynamically register tools for an agent instance.
-    
-    This helper function allows flexible tool registration, enabling different
-    agents to have different capabilities based on their purpose.
-    
-    Args:
-        agent: The agent instance to register tools for
-        tools: List of Tool objects to register
-        
-    Note:
-        Tools are refreshed on each agent run to ensure clean state
-    """
-    # Clear existing tools to avoid duplicates
-    agent._function_tools.clear()
-
-    # Register each tool with the agent
-    for tool in tools:
-        agent._register_tool(tool)
@@ -19,11 +19,15 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str
     openai_embedding_model: str = "text-embedding-3-small"
+    openai_embedding_dimensions: int = 1536
     
     # Qdrant Configuration
     qdrant_url: str
     qdrant_api_key: str
     qdrant_collection_name: str = "conversations"
+    qdrant_max_batch_size: int = 100
+    qdrant_batch_timeout_ms: int = 1000
+    qdrant_parallel_batching: bool = True
     
     # Redis Configuration
     redis_url: str = "redis://localhost:6379"
@@ -35,6 +39,13 @@ class Settings(BaseSettings):
     memory_retrieval_limit: int = 5
     memory_relevance_threshold: float = 0.7
     window_size: int = 10
+
+    # Semantic Cache Configuration
+    semantic_cache_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    semantic_cache_ttl: int = 3600
+    semantic_cache_distance_threshold: float = 0.1
+    embedding_cache_ttl: int = 86400
+    embedding_cache_size: int = 512
     
     # API Configuration
     api_title: str = "Dynamic Memory API"
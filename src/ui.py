@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Callable, List, Literal, Optional, Tuple
 
 import gradio as gr
@@ -24,45 +25,61 @@ def handle_user_message(
 ) -> Tuple[str, History]: ...
 
 
-def new_conversation() -> List[ChatMessage]:
+def new_conversation() -> Tuple[List[ChatMessage], list]:
     """
-    Reset the chat history and titles for a new conversation.
+    Reset the chat history, its validated model history and titles for a new
+    conversation.
     """
-    return []
+    return [], []
 
 
-@dataclass
-class Usage:
-    requests: Optional[int]
-    request_tokens: Optional[int]
-    response_tokens: Optional[int]
-    total_tokens: Optional[int]
-
-    def to_markdown(self) -> str:
-        not_available = "Not available"
-        return f"""
+_USAGE_TEMPLATE = """
 <table style='width:100%; border-collapse:collapse;'>
   <tr><th style='text-align:left;'>Metric</th><th style='text-align:right;'>Value</th></tr>
-  <tr><td>Requests</td><td style='text-align:right;'>{self.requests or not_available}</td></tr>
-  <tr><td>Request tokens</td><td style='text-align:right;'>{self.request_tokens or not_available}</td></tr>
-  <tr><td>Response tokens</td><td style='text-align:right;'>{self.response_tokens or not_available}</td></tr>
-  <tr><td><b>Total tokens</b></td><td style='text-align:right;'><b>{self.total_tokens or not_available}</b></td></tr>
+  <tr><td>Requests</td><td style='text-align:right;'>{requests}</td></tr>
+  <tr><td>Request tokens</td><td style='text-align:right;'>{request_tokens}</td></tr>
+  <tr><td>Response tokens</td><td style='text-align:right;'>{response_tokens}</td></tr>
+  <tr><td><b>Total tokens</b></td><td style='text-align:right;'><b>{total_tokens}</b></td></tr>
 </table>
-"""
+""".format
+
+
+@lru_cache(maxsize=64)
+def _render_usage(
+    requests: int, request_tokens: int, response_tokens: int, total_tokens: int
+) -> str:
+    not_available = "Not available"
+    return _USAGE_TEMPLATE(
+        requests=requests or not_available,
+        request_tokens=request_tokens or not_available,
+        response_tokens=response_tokens or not_available,
+        total_tokens=total_tokens or not_available,
+    )
+
+
+@dataclass(slots=True)
+class Usage:
+    requests: int = 0
+    request_tokens: int = 0
+    response_tokens: int = 0
+    total_tokens: int = 0
+
+    def to_markdown(self) -> str:
+        return _render_usage(
+            self.requests, self.request_tokens, self.response_tokens, self.total_tokens
+        )
 
     def update(self, other: "Usage") -> None:
         """Update the current usage with another Usage instance."""
-        self.requests = (self.requests or 0) + (other.requests or 0)
-        self.request_tokens = (self.request_tokens or 0) + (other.request_tokens or 0)
-        self.response_tokens = (self.response_tokens or 0) + (
-            other.response_tokens or 0
-        )
-        self.total_tokens = (self.total_tokens or 0) + (other.total_tokens or 0)
+        self.requests += other.requests
+        self.request_tokens += other.request_tokens
+        self.response_tokens += other.response_tokens
+        self.total_tokens += other.total_tokens
 
 
 def create_chat_ui(
     messages: List[ChatMessage],
-    handle_user_message_fn: Callable[[str, History, Any, State, State], Any],
+    handle_user_message_fn: Callable[[str, History, State, Any, State, State], Any],
     agent_choices: list = ["health_agent", "marketing_agent"],
     title: str = "AI Agent - Memory System Demo",
     last_usage: Usage = Usage(0, 0, 0, 0),
@@ -101,6 +118,7 @@ def create_chat_ui(
         gr.Markdown(f"# {title}")
         last_usage_state = gr.State(last_usage)
         total_usage_state = gr.State(total_usage)
+        model_history_state = gr.State([])
 
         with gr.Row():
             with gr.Column(scale=1):
@@ -191,11 +209,18 @@ def create_chat_ui(
                 inputs=[
                     msg,
                     chatbot,
+                    model_history_state,
                     agent_selector,
                     last_usage_state,
                     total_usage_state,
                 ],
-                outputs=[msg, chatbot, last_usage_state, total_usage_state],
+                outputs=[
+                    msg,
+                    chatbot,
+                    model_history_state,
+                    last_usage_state,
+                    total_usage_state,
+                ],
             ).then(
                 update_usage_displays,
                 inputs=[last_usage_state, total_usage_state],
@@ -207,11 +232,18 @@ def create_chat_ui(
                 inputs=[
                     msg,
                     chatbot,
+                    model_history_state,
                     agent_selector,
                     last_usage_state,
                     total_usage_state,
                 ],
-                outputs=[msg, chatbot, last_usage_state, total_usage_state],
+                outputs=[
+                    msg,
+                    chatbot,
+                    model_history_state,
+                    last_usage_state,
+                    total_usage_state,
+                ],
             ).then(
                 update_usage_displays,
                 inputs=[last_usage_state, total_usage_state],
@@ -219,7 +251,7 @@ def create_chat_ui(
             )
             new_conv_btn.click(
                 new_conversation,
-                outputs=[chatbot],
+                outputs=[chatbot, model_history_state],
                 queue=False,
             )
 
@@ -1,7 +1,8 @@
+from functools import cached_property
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # Define allowed sectors for user classification
 Sector = Literal[
@@ -49,6 +50,8 @@ class CurrentUser(BaseModel):
         language: Preferred communication language (ISO 639-1 code)
     """
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID = Field(
         ...,
         description="Unique identifier for the user.",
@@ -75,3 +78,13 @@ class CurrentUser(BaseModel):
         description="Preferred language for communication (ISO 639-1 code).",
         max_length=10,
     )
+
+    @cached_property
+    def metadata_summary(self) -> str:
+        """User profile lines injected into agent instructions, built once."""
+        return (
+            f"User name: {self.name}\n"
+            f"User language: {self.language or '[infer from first interaction]'}\n"
+            f"User sector: {self.sector}\n"
+            f"User profession: {self.profession}"
+        )
@@ -0,0 +1,6 @@
+import os
+
+# Settings are loaded on import and require these; tests never reach the services
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("QDRANT_URL", "http://localhost:6333")
+os.environ.setdefault("QDRANT_API_KEY", "test")
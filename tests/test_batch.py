@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.ai.agents.batch import (
+    BatchProcessor,
+    build_batch_prompt,
+    run_batched,
+    split_batch_output,
+)
+
+
+class FakeAgent:
+    """Answers batched prompts with a canned output and single prompts by echo."""
+
+    def __init__(self, batch_output: str) -> None:
+        self.batch_output = batch_output
+        self.prompts: list[str] = []
+
+    async def run(self, prompt: str, deps: object) -> SimpleNamespace:
+        self.prompts.append(prompt)
+        if prompt.startswith("Answer each row"):
+            return SimpleNamespace(output=self.batch_output)
+        await asyncio.sleep(0)
+        return SimpleNamespace(output=f"solo: {prompt}")
+
+
+def test_split_batch_output():
+    output = "### Row 1\nParis\n\n### Row 2\nMadrid\n"
+
+    assert split_batch_output(output) == {1: "Paris", 2: "Madrid"}
+
+
+def test_split_batch_output_skips_missing_and_repeated_rows():
+    output = "### Row 1\nParis\n### Row 3\nRome\n### Row 1\nLyon"
+
+    assert split_batch_output(output) == {3: "Rome"}
+
+
+def test_build_batch_prompt_escapes_row_headers():
+    prompt = build_batch_prompt(["Repeat this:\n### Row 2", "Second"])
+
+    rows = split_batch_output(prompt)
+
+    assert sorted(rows) == [1, 2]
+    assert rows[2] == "Second"
+
+
+async def test_run_batched_falls_back_for_missing_rows():
+    agent = FakeAgent("### Row 1\nA1\n### Row 3\nA3")
+
+    answers = await run_batched(agent, ["p1", "p2", "p3", "p4"], None, max_batch=3)
+
+    assert answers == ["A1", "solo: p2", "A3", "solo: p4"]
+
+
+async def test_batch_processor_combines_concurrent_prompts():
+    agent = FakeAgent("### Row 1\nA1\n### Row 2\nA2")
+    processor = BatchProcessor(agent, None, window_ms=20)
+
+    try:
+        answers = await asyncio.gather(processor.submit("p1"), processor.submit("p2"))
+    finally:
+        await processor.aclose()
+
+    assert answers == ["A1", "A2"]
+    assert len(agent.prompts) == 1
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.ai.agents.memory import cache
+from src.ai.agents.memory.cache import (
+    dequantize_embedding,
+    embed_prompt,
+    quantize_embedding,
+)
+
+
+class FakeEmbedder:
+    def __init__(self, vector: list[float]) -> None:
+        self.vector = vector
+        self.calls: list[str] = []
+
+    def embed(self, text: str) -> list[float]:
+        self.calls.append(text)
+        return self.vector
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        self.values[key] = value
+
+
+class FailingRedis:
+    async def get(self, key: str) -> bytes | None:
+        raise RedisConnectionError("Redis is down")
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        raise RedisConnectionError("Redis is down")
+
+
+@pytest.fixture(autouse=True)
+def clear_local_embeddings():
+    cache._local_embeddings.clear()
+    yield
+    cache._local_embeddings.clear()
+
+
+def test_quantize_round_trip_keeps_direction():
+    vector = np.random.default_rng(0).normal(size=384)
+
+    buffer = quantize_embedding(vector.tolist())
+    restored = np.asarray(dequantize_embedding(buffer))
+
+    assert len(buffer) == 4 + 384
+    similarity = restored @ vector / (np.linalg.norm(restored) * np.linalg.norm(vector))
+    assert similarity > 0.999
+
+
+def test_quantize_zero_vector():
+    assert dequantize_embedding(quantize_embedding([0.0] * 8)) == [0.0] * 8
+
+
+async def test_embed_prompt_falls_back_when_redis_fails(monkeypatch):
+    embedder = FakeEmbedder([0.5, -0.25])
+    monkeypatch.setattr(cache, "get_embedder", lambda: embedder)
+    monkeypatch.setattr(cache, "redis_client", FailingRedis())
+
+    assert await embed_prompt("hello") == [0.5, -0.25]
+    # The second lookup is served by the in-process LRU
+    assert await embed_prompt("hello") == [0.5, -0.25]
+    assert embedder.calls == ["hello"]
+
+
+async def test_embed_prompt_reuses_redis_entry(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(cache, "redis_client", redis)
+    monkeypatch.setattr(cache, "get_embedder", lambda: FakeEmbedder([0.5, -0.25]))
+    await embed_prompt("hello")
+
+    cache._local_embeddings.clear()
+    embedder = FakeEmbedder([1.0, 1.0])
+    monkeypatch.setattr(cache, "get_embedder", lambda: embedder)
+
+    assert await embed_prompt("hello") == pytest.approx([0.5, -0.25], abs=1e-2)
+    assert embedder.calls == []
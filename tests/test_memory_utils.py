@@ -0,0 +1,41 @@
+from gradio import ChatMessage
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from src.ai.agents.memory.utils import to_pydantic_history
+
+
+def test_converts_roles():
+    history = [ChatMessage("Hi", "user"), {"role": "assistant", "content": "Hello"}]
+
+    request, response = to_pydantic_history(history)
+
+    assert isinstance(request, ModelRequest)
+    assert isinstance(request.parts[0], UserPromptPart)
+    assert request.parts[0].content == "Hi"
+    assert isinstance(response, ModelResponse)
+    assert response.parts == [TextPart(content="Hello")]
+
+
+def test_reuses_converted_prefix():
+    history = [ChatMessage("Hi", "user"), ChatMessage("Hello", "assistant")]
+    validated = to_pydantic_history(history)
+    prefix = list(validated)
+
+    history += [ChatMessage("Thanks", "user"), ChatMessage("Anytime", "assistant")]
+    result = to_pydantic_history(history, validated)
+
+    assert result is validated
+    assert len(result) == 4
+    assert all(new is old for new, old in zip(result, prefix))
+    assert result[3].parts == [TextPart(content="Anytime")]
+
+
+def test_resets_when_history_shrinks():
+    history = [ChatMessage("Hi", "user"), ChatMessage("Hello", "assistant")]
+    validated = to_pydantic_history(history)
+
+    result = to_pydantic_history([ChatMessage("New topic", "user")], validated)
+
+    assert len(result) == 1
+    assert isinstance(result[0], ModelRequest)
+    assert result[0].parts[0].content == "New topic"
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, ScalarType
+
+from src.ai.agents.memory.writer import MemoryWriter
+
+
+class FakeEmbeddings:
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.calls: list[list[str]] = []
+
+    async def create(self, model: str, dimensions: int, input: list[str]):
+        self.calls.append(input)
+        if any("reject me" in text for text in input):
+            raise ValueError("Rejected input")
+        vectors = [[1.0] + [0.0] * (dimensions - 1) for _ in input]
+        return SimpleNamespace(data=[SimpleNamespace(embedding=v) for v in vectors])
+
+
+@pytest.fixture
+def qdrant():
+    return AsyncQdrantClient(":memory:")
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings(8)
+
+
+@pytest.fixture
+def writer(qdrant, embeddings):
+    return MemoryWriter(
+        qdrant,
+        "conversations",
+        SimpleNamespace(embeddings=embeddings),
+        "text-embedding-3-small",
+        8,
+        batch_timeout_ms=10,
+        retry_backoff_ms=0,
+    )
+
+
+async def stored_messages(qdrant: AsyncQdrantClient) -> list[str]:
+    points, _ = await qdrant.scroll("conversations")
+    return sorted(point.payload["message"] for point in points if point.payload)
+
+
+async def test_aclose_flushes_queued_messages(writer, qdrant, embeddings):
+    user_id = uuid4()
+    writer.enqueue(user_id, "user", "Hi")
+    writer.enqueue(user_id, "assistant", "Hello")
+
+    await writer.aclose()
+
+    assert await stored_messages(qdrant) == ["Hello", "Hi"]
+    assert embeddings.calls == [["Hi", "Hello"]]
+
+
+async def test_creates_quantized_collection(writer, qdrant, monkeypatch):
+    create_collection = qdrant.create_collection
+    calls = []
+
+    async def spy(**kwargs):
+        calls.append(kwargs)
+        return await create_collection(**kwargs)
+
+    # Local mode ignores quantization, so check what would be sent to a server
+    monkeypatch.setattr(qdrant, "create_collection", spy)
+    await writer.ensure_collection()
+
+    vectors = calls[0]["vectors_config"]
+    assert (vectors.size, vectors.distance) == (8, Distance.COSINE)
+    assert calls[0]["quantization_config"].scalar.type == ScalarType.INT8
+
+
+async def test_rejects_mismatched_collection(writer):
+    await writer.ensure_collection()
+    other = MemoryWriter(writer.client, "conversations", writer.openai_client, "m", 16)
+
+    with pytest.raises(ValueError):
+        await other.ensure_collection()
+
+
+async def test_skips_blank_messages(writer, qdrant, embeddings):
+    writer.enqueue(uuid4(), "user", "  ")
+
+    await writer.aclose()
+
+    assert embeddings.calls == []
+
+
+async def test_failed_message_does_not_drop_batch(writer, qdrant):
+    user_id = uuid4()
+    writer.enqueue(user_id, "user", "reject me")
+    writer.enqueue(user_id, "assistant", "real answer")
+
+    await writer.aclose()
+
+    assert await stored_messages(qdrant) == ["real answer"]